@@ -0,0 +1,166 @@
+from pathlib import Path
+import os
+import json
+import threading
+import logging
+
+try:
+    import fcntl  # POSIX only; used to serialise appends across processes
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+# Per-file states recorded in the journal
+QUEUED = "queued"
+IN_FLIGHT = "in-flight"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_JOURNAL_NAME = ".readcraft-journal.jsonl"
+
+
+def default_journal_path(output_dir=None, shards=1, shard_index=0):
+    """Return where the journal lives when --journal is not given.
+
+    Each shard gets its own journal so a fresh run of one shard never
+    truncates the progress recorded by another.
+    """
+    name = DEFAULT_JOURNAL_NAME
+    if shards > 1:
+        name = f".readcraft-journal-shard{shard_index}.jsonl"
+    return Path(output_dir or ".") / name
+
+
+def journal_key(file_path):
+    """Key a file by its resolved path so every spelling of it matches.
+
+    ``src/a.py``, ``$PWD/src/a.py`` and the same file reached from another
+    working directory all map to one entry, both when recording and when
+    deciding what ``--resume`` still has to do.
+    """
+    return str(Path(file_path).resolve())
+
+
+def load_journal(journal_path):
+    """Replay a journal file and return the latest record for every file.
+
+    A torn last line (the process died mid-write) is skipped, so a crash can
+    at worst forget the file that was being written at that moment.
+    """
+    states = {}
+    journal_path = Path(journal_path)
+    if not journal_path.exists():
+        return states
+
+    with open(journal_path, "r", encoding="utf-8") as journal_file:
+        for line in journal_file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logging.warning(f"Skipping corrupt journal line in {journal_path}")
+                continue
+            if "file" in record and "state" in record:
+                states[record["file"]] = record
+    return states
+
+
+def select_pending(files, states, resume=False, retry_failed=False):
+    """Pick the files that still need work according to a replayed journal.
+
+    --resume keeps everything that never reached a final state (queued,
+    in-flight or never seen); --retry-failed keeps only the failures.
+    Both together run the union.
+    """
+    if not resume and not retry_failed:
+        return list(files)
+
+    pending = []
+    for file_path in files:
+        state = states.get(journal_key(file_path), {}).get("state")
+        if retry_failed and state == FAILED:
+            pending.append(file_path)
+        elif resume and state not in (DONE, FAILED):
+            pending.append(file_path)
+    return pending
+
+
+class RunJournal:
+    """Append-only, crash-safe log of per-file progress.
+
+    Every record is a single JSON line written with one ``os.write`` on an
+    ``O_APPEND`` descriptor, so lines from concurrent threads or processes
+    never interleave. Records reach the OS immediately (surviving a killed
+    process); ``fsync`` is batched every ``sync_every`` records to keep the
+    overhead low, and always happens on ``close``.
+    """
+
+    def __init__(self, journal_path, truncate=False, sync_every=32):
+        self.journal_path = Path(journal_path)
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self.sync_every = max(1, sync_every)
+        self._lock = threading.Lock()
+        self._unsynced = 0
+
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        if truncate:
+            flags |= os.O_TRUNC
+        self._fd = os.open(self.journal_path, flags, 0o644)
+
+    def record(self, file_path, state, output=None, usage=None, error=None):
+        """Append one state transition for ``file_path``."""
+        entry = {"file": journal_key(file_path), "state": state}
+        if output is not None:
+            entry["output"] = str(output)
+        if usage:
+            entry["usage"] = usage
+        if error:
+            entry["error"] = error
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+
+        with self._lock:
+            if self._fd is None:
+                raise ValueError("Journal is closed")
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                os.write(self._fd, line)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every:
+                self._sync()
+
+    def queued(self, file_path):
+        self.record(file_path, QUEUED)
+
+    def in_flight(self, file_path):
+        self.record(file_path, IN_FLIGHT)
+
+    def done(self, file_path, output=None, usage=None):
+        self.record(file_path, DONE, output=output, usage=usage)
+
+    def failed(self, file_path, error=None, usage=None):
+        self.record(file_path, FAILED, usage=usage, error=error)
+
+    def _sync(self):
+        os.fsync(self._fd)
+        self._unsynced = 0
+
+    def close(self):
+        with self._lock:
+            if self._fd is None:
+                return
+            if self._unsynced:
+                self._sync()
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
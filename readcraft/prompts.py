@@ -0,0 +1,208 @@
+from string import Template
+import hashlib
+import logging
+
+# Bump when the built-in templates change in a way that should invalidate
+# anything cached from earlier prompts
+TEMPLATE_VERSION = "1"
+
+DEFAULT_STYLE = "fun"
+
+# File extension -> language name used in the prompt
+LANGUAGE_MAP = {
+    ".py": "Python",
+    ".pyw": "Python",
+    ".ipynb": "Jupyter Notebook",
+    ".js": "JavaScript",
+    ".mjs": "JavaScript",
+    ".cjs": "JavaScript",
+    ".jsx": "JavaScript (React)",
+    ".ts": "TypeScript",
+    ".tsx": "TypeScript (React)",
+    ".java": "Java",
+    ".kt": "Kotlin",
+    ".kts": "Kotlin",
+    ".scala": "Scala",
+    ".groovy": "Groovy",
+    ".c": "C",
+    ".h": "C",
+    ".cc": "C++",
+    ".cpp": "C++",
+    ".cxx": "C++",
+    ".hpp": "C++",
+    ".cs": "C#",
+    ".fs": "F#",
+    ".go": "Go",
+    ".rs": "Rust",
+    ".swift": "Swift",
+    ".m": "Objective-C",
+    ".rb": "Ruby",
+    ".php": "PHP",
+    ".pl": "Perl",
+    ".lua": "Lua",
+    ".r": "R",
+    ".jl": "Julia",
+    ".dart": "Dart",
+    ".ex": "Elixir",
+    ".exs": "Elixir",
+    ".erl": "Erlang",
+    ".hs": "Haskell",
+    ".clj": "Clojure",
+    ".ml": "OCaml",
+    ".zig": "Zig",
+    ".nim": "Nim",
+    ".sh": "Shell",
+    ".bash": "Bash",
+    ".zsh": "Zsh",
+    ".ps1": "PowerShell",
+    ".bat": "Batch",
+    ".sql": "SQL",
+    ".html": "HTML",
+    ".css": "CSS",
+    ".scss": "SCSS",
+    ".vue": "Vue",
+    ".svelte": "Svelte",
+    ".yaml": "YAML",
+    ".yml": "YAML",
+    ".toml": "TOML",
+    ".json": "JSON",
+    ".tf": "Terraform",
+    ".dockerfile": "Dockerfile",
+    ".mk": "Makefile",
+}
+
+# Built-in output styles. ``system`` and ``instructions`` form the stable
+# prefix shared by every request; ``user`` carries the per-file part.
+DEFAULT_TEMPLATES = {
+    "fun": {
+        "system": "You are a helpful assistant.",
+        "instructions": (
+            "Please make the README fun and engaging! Add emojis to highlight sections and "
+            "use **bold text** for important terms or section titles like 'Function', 'Usage', "
+            "and 'Examples'. Avoid unnecessary sections like 'Authors' or 'Acknowledgments'."
+        ),
+        "user": "Generate a README for this $file_type:\n\n$file_contents",
+    },
+    "concise": {
+        "system": "You are a technical writer producing concise project documentation.",
+        "instructions": (
+            "Write a short, professional README in Markdown with the sections "
+            "'Overview', 'Usage' and 'Examples'. Use fenced code blocks for code "
+            "and do not add emojis or sections like 'Authors' or 'Acknowledgments'."
+        ),
+        "user": "Generate a README for this $file_type:\n\n$file_contents",
+    },
+}
+
+
+def file_type_for(file_extension, language_map=LANGUAGE_MAP):
+    """Describe a file for the prompt, e.g. ``.py`` -> ``Python script``."""
+    language = language_map.get((file_extension or "").lower())
+    return f"{language} script" if language else "script"
+
+
+class PromptTemplate:
+    """A template compiled once and reused for every file it applies to."""
+
+    def __init__(self, name, system, instructions, user, language_map=LANGUAGE_MAP):
+        self.name = name
+        # The prefix never contains per-file data so providers can cache it
+        self.prefix = f"{system}\n\n{instructions}"
+        self.user = Template(user)
+        self.language_map = language_map
+        # The language map decides the $file_type the model sees, so remapping
+        # an extension must change the version just like editing the text
+        languages = "\0".join(
+            f"{ext}={language}" for ext, language in sorted(language_map.items())
+        )
+        digest = hashlib.sha256(
+            f"{TEMPLATE_VERSION}\0{self.prefix}\0{user}\0{languages}".encode("utf-8")
+        ).hexdigest()
+        self.version = f"{name}@{digest[:12]}"
+
+    def render(self, file_type, file_contents):
+        """Return the chat messages for one file."""
+        return [
+            {"role": "system", "content": self.prefix},
+            {
+                "role": "user",
+                "content": self.user.safe_substitute(
+                    file_type=file_type, file_contents=file_contents
+                ),
+            },
+        ]
+
+    def cache_key(self, model, file_contents, file_extension=None):
+        """Key a cached response on the model, template version and input.
+
+        The extension is resolved to the ``$file_type`` the prompt would use,
+        so the same contents sent as ``.py`` and ``.rs`` get different keys.
+        """
+        file_type = file_type_for(file_extension, self.language_map)
+        key = hashlib.sha256()
+        for part in (model, self.version, file_type, file_contents):
+            key.update(part.encode("utf-8"))
+            key.update(b"\0")
+        return key.hexdigest()
+
+
+class PromptBuilder:
+    """Select and render compiled templates by output style and language.
+
+    Templates are looked up as ``<style>.<language>`` first (for example
+    ``concise.python``, configured as ``[prompt.templates.concise.python]``)
+    and then as ``<style>``.
+    """
+
+    def __init__(self, style=DEFAULT_STYLE, templates=None, languages=None):
+        self.style = style
+        self.language_map = dict(LANGUAGE_MAP)
+        self.language_map.update(
+            {ext.lower(): name for ext, name in (languages or {}).items()}
+        )
+        merged = dict(DEFAULT_TEMPLATES)
+        for name, fields in (templates or {}).items():
+            base = merged.get(name, DEFAULT_TEMPLATES[DEFAULT_STYLE])
+            own = {k: v for k, v in fields.items() if not isinstance(v, dict)}
+            merged[name] = {**base, **own}
+            # Nested tables are per-language overrides of this style
+            for language, overrides in fields.items():
+                if isinstance(overrides, dict):
+                    merged[f"{name}.{language.lower()}"] = {
+                        **merged[name],
+                        **overrides,
+                    }
+
+        if style not in merged:
+            logging.warning(f"Unknown prompt style '{style}', using '{DEFAULT_STYLE}'")
+            self.style = DEFAULT_STYLE
+        self.templates = {
+            name: PromptTemplate(
+                name,
+                fields["system"],
+                fields["instructions"],
+                fields["user"],
+                language_map=self.language_map,
+            )
+            for name, fields in merged.items()
+        }
+
+    @classmethod
+    def from_config(cls, config, style=None):
+        """Build from the ``[prompt]`` table of the TOML config."""
+        prompt_config = config.get("prompt", {})
+        return cls(
+            style=style or prompt_config.get("style", DEFAULT_STYLE),
+            templates=prompt_config.get("templates"),
+            languages=prompt_config.get("languages"),
+        )
+
+    def template_for(self, file_extension):
+        language = self.language_map.get((file_extension or "").lower(), "")
+        specific = f"{self.style}.{language.lower()}"
+        return self.templates.get(specific) or self.templates[self.style]
+
+    def build_messages(self, file_contents, file_extension):
+        template = self.template_for(file_extension)
+        file_type = file_type_for(file_extension, self.language_map)
+        return template.render(file_type, file_contents)
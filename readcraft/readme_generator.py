@@ -7,7 +7,23 @@ import sys  # Required for output control (stdout, stderr)
 import json  # For JSON output
 import toml  # To handle TOML config files
 import logging
-
+import time
+from readcraft.journal import (
+    RunJournal,
+    default_journal_path,
+    load_journal,
+    select_pending,
+)
+from readcraft.prompts import PromptBuilder
+from readcraft.validation import ReadmeValidator
+from readcraft.sharding import (
+    RateBudget,
+    filter_shard,
+    relative_key,
+    run_workers,
+    summarize,
+    write_results,
+)
 
 # Load environment variables from a .env file (if available)
 load_dotenv(dotenv_path=".env")
@@ -15,6 +31,34 @@ load_dotenv(dotenv_path=".env")
 # Setup logging configuration
 logging.basicConfig(level=logging.DEBUG, format="%(levelname)s: %(message)s")
 
+API_URL = "https://api.groq.com/openai/v1/chat/completions"
+# Completion budget per request; doubled when a regeneration follows a
+# response that was cut off at the limit
+MAX_TOKENS = 1000
+
+# Per-process HTTP state: the endpoint, a pooled session for worker
+# processes and an optional requests-per-second budget shared across workers
+_api_url = API_URL
+_session = None
+_rate_budget = None
+
+# Compiled prompt templates; replaced from the TOML config by main()
+_prompt_builder = PromptBuilder()
+
+
+def configure_http(session=None, rate_budget=None, api_url=API_URL):
+    """Install the endpoint, connection pool and rate budget used by API requests."""
+    global _api_url, _session, _rate_budget
+    _api_url = api_url
+    _session = session
+    _rate_budget = rate_budget
+
+
+def configure_prompts(prompt_builder):
+    """Install the compiled prompt templates used by API requests."""
+    global _prompt_builder
+    _prompt_builder = prompt_builder
+
 
 # Utility function to handle file input/output
 def handle_file_io(config_filename=".your-toolname-config.toml"):
@@ -28,64 +72,57 @@ def handle_file_io(config_filename=".your-toolname-config.toml"):
     return {}
 
 
-def make_api_request(api_key, model, file_contents, file_extension, stream=False):
-    url = "https://api.groq.com/openai/v1/chat/completions"
-
-    # Determine the type of script based on the file extension
-    if file_extension == ".py":
-        file_type = "Python script"
-    elif file_extension == ".js":
-        file_type = "JavaScript script"
-    else:
-        file_type = "script"
+def make_api_request(
+    api_key, model, file_contents, file_extension, stream=False, max_tokens=MAX_TOKENS
+):
+    """Return ``(content, token_usage, finish_reason)``; all None on failure."""
+    url = _api_url
 
-    # Updated prompt with file type and instructions
+    # Stable instructions go first so providers can reuse the cached prefix
     payload = {
         "model": model,
-        "messages": [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {
-                "role": "user",
-                "content": (
-                    f"Generate a README for this {file_type}:\n\n{file_contents}\n\n"
-                    "Please make the README fun and engaging! Add emojis to highlight sections and "
-                    "use **bold text** for important terms or section titles like 'Function', 'Usage', "
-                    "and 'Examples'. Avoid unnecessary sections like 'Authors' or 'Acknowledgments'."
-                ),
-            },
-        ],
-        "max_tokens": 1000,
+        "messages": _prompt_builder.build_messages(file_contents, file_extension),
+        "max_tokens": max_tokens,
     }
 
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    http = _session or requests
+    if _rate_budget:
+        _rate_budget.acquire()
 
     try:
         if stream:
-            response = requests.post(url, json=payload, headers=headers, stream=True)
+            response = http.post(url, json=payload, headers=headers, stream=True)
             response.raise_for_status()
             accumulated_content = []
+            finish_reason = None
             for chunk in response.iter_lines():
                 if chunk:
                     chunk_data = json.loads(chunk.decode("utf-8"))
                     if "choices" in chunk_data:
-                        content = chunk_data["choices"][0]["message"]["content"]
+                        choice = chunk_data["choices"][0]
+                        content = choice["message"]["content"]
                         logging.info(content)  # Print each streamed chunk
                         accumulated_content.append(content)
-            return "\n".join(accumulated_content), {}
+                        finish_reason = choice.get("finish_reason") or finish_reason
+            content, token_usage = "\n".join(accumulated_content), {}
         else:
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            response = http.post(url, json=payload, headers=headers, timeout=10)
             response.raise_for_status()
-            content = response.json().get("choices")[0]["message"]["content"]
+            choice = response.json().get("choices")[0]
+            content = choice["message"]["content"]
+            finish_reason = choice.get("finish_reason")
             token_usage = response.json().get("usage", {})
-            return content, token_usage
     except requests.RequestException as e:
         logging.error(f"API request failed: {e}")
-        return None, None
+        return None, None, None
+
+    return content, token_usage, finish_reason
 
 
 # Function to get token usage from the API
 def get_token_usage(api_key, model):
-    url = "https://api.groq.com/openai/v1/chat/completions"
+    url = _api_url
 
     payload = {
         "model": model,
@@ -103,19 +140,42 @@ def get_token_usage(api_key, model):
         return None
 
 
-def generate_readme(file_contents, api_key, model, file_extension, stream=False):
+def request_readme(
+    file_contents, api_key, model, file_extension, stream=False, max_tokens=None
+):
+    """Return ``(content, token_usage, finish_reason)`` for one file.
+
+    ``max_tokens`` overrides the request's default completion budget.
+    """
     # Check if file_contents is empty and handle it accordingly
     if not file_contents:
-        return "No content to process"
+        return "No content to process", {}, None
 
-    content, token_usage = make_api_request(
-        api_key, model, file_contents, file_extension, stream
+    options = {"max_tokens": max_tokens} if max_tokens else {}
+    content, token_usage, finish_reason = make_api_request(
+        api_key, model, file_contents, file_extension, stream, **options
     )
     if token_usage:
         logging.info(f"Token usage: {token_usage}")
+    return content, token_usage or {}, finish_reason
+
+
+def generate_readme(file_contents, api_key, model, file_extension, stream=False):
+    content, _, _ = request_readme(
+        file_contents, api_key, model, file_extension, stream
+    )
     return content
 
 
+# Sum the numeric token counts of several responses
+def add_usage(total, usage):
+    combined = dict(total)
+    for key, value in (usage or {}).items():
+        if isinstance(value, (int, float)):
+            combined[key] = combined.get(key, 0) + value
+    return combined
+
+
 # Centralized configuration manager to handle API key, model, and output directory
 class ConfigManager:
     def __init__(self, args, config):
@@ -156,6 +216,8 @@ class OutputManager:
             with open(output_file, "w") as readme_file:
                 readme_file.write(readme_content)
             logging.info(f"README generated and saved as {output_file}")
+            return output_file
+        return None
 
     def save_json(self, file_path, result):
         """Save the output result in JSON format, if required."""
@@ -166,7 +228,121 @@ class OutputManager:
             logging.info(f"JSON output saved as {json_output_file}")
 
 
-def main():
+# Expand the CLI arguments into (input root, file) pairs; the root is the
+# directory argument itself, or the parent of a file argument
+def collect_files(files_or_directory):
+    files = []
+    for path in files_or_directory:
+        path = Path(path)
+        if path.is_dir():
+            root, candidates = path, list(path.glob("*"))
+        else:
+            root, candidates = path.parent, [path]
+        files.extend(
+            (root, file_path) for file_path in candidates if file_path.is_file()
+        )
+    return files
+
+
+def process_file(
+    file_path, config_manager, output_manager, args, journal=None, validator=None
+):
+    """Generate, validate, save and journal the README for a single file.
+
+    READMEs that fail local validation are regenerated up to
+    ``args.quality_retries`` times before the file is marked as failed. Any
+    error raised for this file (e.g. an undecodable binary) marks only this
+    file as failed, so the rest of the run and later resumes can finish.
+    """
+    validator = validator or ReadmeValidator()
+    if journal:
+        journal.in_flight(file_path)
+
+    try:
+        return _generate_for_file(
+            file_path, config_manager, output_manager, args, journal, validator
+        )
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        logging.error(f"Failed to generate README for {file_path}: {error}")
+        if journal:
+            journal.failed(file_path, error=error)
+        return {
+            "file": str(file_path),
+            "readme_content": None,
+            "status": "failure",
+            "usage": {},
+            "error": error,
+            "quality": {"passed": False, "issues": [error], "attempts": 0},
+        }
+
+
+def _generate_for_file(
+    file_path, config_manager, output_manager, args, journal, validator
+):
+    with open(file_path, "r") as f:
+        content = f.read()
+    logging.info(f"Processing file: {file_path}")
+
+    token_usage = {}
+    attempts = 0
+    max_tokens = None
+    while True:
+        attempts += 1
+        # Pass the file extension to request_readme
+        readme_content, usage, finish_reason = request_readme(
+            content,
+            config_manager.api_key,
+            config_manager.model,
+            file_path.suffix,
+            stream=args.stream,
+            max_tokens=max_tokens,
+        )
+        token_usage = add_usage(token_usage, usage)
+
+        # Nothing to check for empty sources; failed requests are not retried here
+        if not content:
+            issues = []
+            break
+        issues = validator.validate(readme_content, finish_reason)
+        if not issues or readme_content is None or attempts > args.quality_retries:
+            break
+        logging.warning(
+            f"README for {file_path} failed validation ({'; '.join(issues)}), "
+            "regenerating"
+        )
+        # Resending a truncated request unchanged would just hit the same limit
+        if finish_reason == "length":
+            max_tokens = (max_tokens or MAX_TOKENS) * 2
+
+    passed = not issues
+    result = {
+        "file": str(file_path),
+        "readme_content": readme_content,
+        "status": "success" if passed else "failure",
+        "usage": token_usage,
+        "prompt_version": _prompt_builder.template_for(file_path.suffix).version,
+        "quality": {"passed": passed, "issues": issues, "attempts": attempts},
+    }
+
+    output_file = None
+    if readme_content:
+        output_file = output_manager.save_readme(file_path, readme_content)
+        if args.json:
+            output_manager.save_json(file_path, result)
+
+    if passed:
+        if journal:
+            journal.done(file_path, output=output_file, usage=token_usage)
+    else:
+        logging.error(f"Failed to generate README for {file_path}: {'; '.join(issues)}")
+        if journal:
+            journal.failed(file_path, error="; ".join(issues), usage=token_usage)
+
+    return result
+
+
+def build_parser():
     # Initialize the argument parser for handling CLI inputs
     parser = argparse.ArgumentParser(
         description="CLI tool for generating README files using the Groq API."
@@ -210,9 +386,137 @@ def main():
     parser.add_argument(
         "--stream", "-s", action="store_true", help="Stream responses in real-time"
     )
+    parser.add_argument(
+        "--journal",
+        type=str,
+        help="Path of the run journal (defaults to .readcraft-journal.jsonl in --output-dir)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip files the journal already finished and process the rest",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Re-run only the files the journal recorded as failed",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Split the input into N deterministic shards (for several runners)",
+    )
+    parser.add_argument(
+        "--shard-index",
+        type=int,
+        default=0,
+        help="Which shard (0-based) this run processes when --shards is set",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=1,
+        help="Number of local worker processes to spread the files over",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        help="Global budget of API requests per second shared by all workers",
+    )
+    parser.add_argument(
+        "--quality-retries",
+        type=int,
+        default=1,
+        help="Times to regenerate a README that fails local validation (default: 1)",
+    )
+    parser.add_argument(
+        "--style",
+        type=str,
+        help="Prompt template style to use, e.g. 'fun' or 'concise' (default: fun)",
+    )
+    return parser
+
+
+def run_pipeline(args, config_manager, output_manager, worker_index=None):
+    """Process this run's share of the input files and return the results."""
+    entries = filter_shard(
+        collect_files(args.files_or_directory),
+        args.shards,
+        args.shard_index,
+        args.workers if worker_index is not None else 1,
+        worker_index or 0,
+        key=relative_key,
+    )
+    files = [file_path for _, file_path in entries]
+
+    journal = None
+    if args.journal or config_manager.output_dir:
+        journal_path = args.journal or default_journal_path(
+            config_manager.output_dir, args.shards, args.shard_index
+        )
+        reuse = args.resume or args.retry_failed
+        if reuse:
+            files = select_pending(
+                files, load_journal(journal_path), args.resume, args.retry_failed
+            )
+            logging.info(f"{len(files)} file(s) left to process from {journal_path}")
+        # Workers share the journal the coordinator already prepared
+        journal = RunJournal(journal_path, truncate=not reuse and worker_index is None)
+
+    validator = ReadmeValidator.from_config(config_manager.config)
+    results = []
+    all_success = True
+
+    try:
+        if journal:
+            for file_path in files:
+                journal.queued(file_path)
+
+        for file_path in files:
+            result = process_file(
+                file_path, config_manager, output_manager, args, journal, validator
+            )
+            results.append(result)
+            if result["status"] != "success":
+                all_success = False
+    finally:
+        if journal:
+            journal.close()
+
+    return results, all_success
+
+
+# Pool initializer: every worker process gets its own connection pool
+def init_worker(rate_budget=None):
+    configure_http(session=requests.Session(), rate_budget=rate_budget)
+
+
+def run_worker(args, worker_index):
+    """Entry point of one worker process started by the coordinator."""
+    started = time.time()
+    config = handle_file_io()
+    configure_prompts(PromptBuilder.from_config(config, args.style))
+    config_manager = ConfigManager(args, config)
+    output_manager = OutputManager(config_manager.output_dir, args.json)
+    results, _ = run_pipeline(args, config_manager, output_manager, worker_index)
+    metrics = summarize(results, time.time() - started)
+    metrics["worker_index"] = worker_index
+    return results, metrics
 
+
+def main():
+    # Initialize the argument parser for handling CLI inputs
+    parser = build_parser()
     args = parser.parse_args()
+    if args.shards < 1 or not 0 <= args.shard_index < args.shards:
+        parser.error("--shard-index must be between 0 and --shards - 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
     config = handle_file_io()
+    configure_prompts(PromptBuilder.from_config(config, args.style))
 
     # Create a ConfigManager instance to centralize configuration handling
     config_manager = ConfigManager(args, config)
@@ -227,45 +531,36 @@ def main():
         logging.error("No API key provided. Use --api-key or set GROQ_API_KEY in .env")
         sys.exit(1)
 
-    results = []
-    all_success = True
+    reuse = args.resume or args.retry_failed
+    if reuse and not (args.journal or config_manager.output_dir):
+        logging.error("--resume/--retry-failed need --journal or --output-dir")
+        sys.exit(1)
 
-    for path in args.files_or_directory:
-        path = Path(path)
-        if path.is_dir():
-            files = list(path.glob("*"))
-        else:
-            files = [path]
+    rate_budget = RateBudget(args.rate_limit) if args.rate_limit else None
+    started = time.time()
 
-        for file_path in files:
-            if not file_path.is_file():
-                continue
-
-            with open(file_path, "r") as f:
-                content = f.read()
-                logging.info(f"Processing file: {file_path}")
-
-                # Pass the file extension to generate_readme
-                readme_content = generate_readme(
-                    content,
-                    config_manager.api_key,
-                    config_manager.model,
-                    file_path.suffix,
-                    stream=args.stream,
-                )
-
-                result = {
-                    "file": str(file_path),
-                    "readme_content": readme_content,
-                    "status": "success" if readme_content else "failure",
-                }
-
-                if readme_content:
-                    output_manager.save_readme(file_path, readme_content)
-                    if args.json:
-                        output_manager.save_json(file_path, result)
-                else:
-                    logging.error(f"Failed to generate README for {file_path}")
+    if args.workers > 1:
+        # Start a fresh journal once here; workers only ever append to it
+        if not reuse and (args.journal or config_manager.output_dir):
+            journal_path = args.journal or default_journal_path(
+                config_manager.output_dir, args.shards, args.shard_index
+            )
+            RunJournal(journal_path, truncate=True).close()
+
+        results, metrics = run_workers(
+            args, run_worker, args.workers, rate_budget, initializer=init_worker
+        )
+        all_success = metrics["failed"] == 0 and not metrics["failed_workers"]
+    else:
+        configure_http(rate_budget=rate_budget)
+        results, all_success = run_pipeline(args, config_manager, output_manager)
+        metrics = summarize(results, time.time() - started)
+
+    if config_manager.output_dir and (args.json or args.workers > 1 or args.shards > 1):
+        name = "readcraft-results.json"
+        if args.shards > 1:
+            name = f"readcraft-results-shard{args.shard_index}.json"
+        write_results(config_manager.output_dir / name, results, metrics)
 
     if args.json and not config_manager.output_dir:
         print(json.dumps(results, indent=2))
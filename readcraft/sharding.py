@@ -0,0 +1,157 @@
+from pathlib import Path
+import hashlib
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import time
+import logging
+
+
+def shard_of(file_path, shards):
+    """Map a path to a shard number in ``range(shards)``.
+
+    The hash is taken over the POSIX form of the path so every runner, on
+    any platform and under any ``PYTHONHASHSEED``, agrees on the split.
+    """
+    digest = hashlib.sha1(Path(file_path).as_posix().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shards
+
+
+def relative_key(entry):
+    """Shard key of a ``(root, file_path)`` pair from ``collect_files``.
+
+    Hashing the path relative to its input root means runners that check
+    the tree out under different absolute prefixes still agree on the split.
+    """
+    root, file_path = entry
+    return Path(file_path).relative_to(root).as_posix()
+
+
+def filter_shard(files, shards=1, shard_index=0, workers=1, worker_index=0, key=None):
+    """Keep the files owned by one worker of one shard.
+
+    Runner shards and local workers are combined into ``shards * workers``
+    slices, so worker ``w`` of shard ``i`` owns slice ``i + shards * w``.
+    This keeps every file of shard ``i`` on runner ``i`` while still spreading
+    them evenly over that runner's workers. ``key`` maps each item to the
+    path that is hashed (the item itself by default).
+    """
+    total = shards * workers
+    if total <= 1:
+        return list(files)
+    key = key or (lambda item: item)
+    slice_index = shard_index + shards * worker_index
+    return [item for item in files if shard_of(key(item), total) == slice_index]
+
+
+class RateBudget:
+    """Requests-per-second budget shared by every process that holds it.
+
+    Callers reserve the next free time slot under a shared lock and then
+    sleep outside the lock until their slot arrives.
+    """
+
+    def __init__(self, requests_per_second, context=multiprocessing):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        self.interval = 1.0 / requests_per_second
+        self._next_slot = context.Value("d", 0.0)
+
+    def acquire(self):
+        with self._next_slot.get_lock():
+            now = time.time()
+            slot = max(now, self._next_slot.value)
+            self._next_slot.value = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def summarize(results, elapsed, workers=None):
+    """Build the metrics block stored next to merged results."""
+    succeeded = sum(1 for result in results if result["status"] == "success")
+    total_tokens = sum(
+        (result.get("usage") or {}).get("total_tokens", 0) for result in results
+    )
+    checked = [result["quality"] for result in results if "quality" in result]
+    quality_passed = sum(1 for quality in checked if quality["passed"])
+    metrics = {
+        "files": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "total_tokens": total_tokens,
+        "quality_passed": quality_passed,
+        "quality_failed": len(checked) - quality_passed,
+        "quality_pass_rate": (
+            round(quality_passed / len(checked), 4) if checked else None
+        ),
+        "regenerations": sum(quality["attempts"] - 1 for quality in checked),
+        "elapsed_seconds": round(elapsed, 3),
+    }
+    if workers is not None:
+        metrics["workers"] = workers
+    return metrics
+
+
+def write_results(results_path, results, metrics):
+    """Write merged results and metrics as a single JSON document."""
+    results_path = Path(results_path)
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(results_path, "w") as results_file:
+        json.dump({"metrics": metrics, "results": results}, results_file, indent=2)
+    logging.info(f"Merged results saved as {results_path}")
+
+
+def run_workers(
+    args, worker_fn, workers, rate_budget=None, initializer=None, context=None
+):
+    """Run ``worker_fn(args, worker_index)`` in ``workers`` local processes.
+
+    Each worker runs in its own single-process executor, so a worker that
+    dies (OOM kill, segfault) or raises only loses its own slice: the error
+    is recorded in its metrics entry and the other workers' results are
+    still merged. Files of a failed worker stay unfinished in the journal
+    and are picked up by ``--resume``.
+    """
+    started = time.time()
+    context = context or multiprocessing.get_context()
+    executors = [
+        ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=context,
+            initializer=initializer,
+            initargs=(rate_budget,),
+        )
+        for _ in range(workers)
+    ]
+
+    results = []
+    per_worker = []
+    failed_workers = []
+    try:
+        futures = [
+            executor.submit(worker_fn, args, worker_index)
+            for worker_index, executor in enumerate(executors)
+        ]
+        for worker_index, future in enumerate(futures):
+            try:
+                worker_results, worker_metrics = future.result()
+            except BrokenProcessPool:
+                error = "worker process died unexpectedly"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                results.extend(worker_results)
+                per_worker.append(worker_metrics)
+                continue
+            logging.error(f"Worker {worker_index} failed: {error}")
+            per_worker.append({"worker_index": worker_index, "error": error})
+            failed_workers.append(worker_index)
+    finally:
+        for executor in executors:
+            executor.shutdown(wait=True)
+
+    metrics = summarize(results, time.time() - started, workers=per_worker)
+    metrics["failed_workers"] = failed_workers
+    return results, metrics
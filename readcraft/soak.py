@@ -0,0 +1,526 @@
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import logging
+import requests
+from readcraft.readme_generator import (
+    ConfigManager,
+    OutputManager,
+    configure_http,
+    process_file,
+)
+from readcraft.journal import RunJournal
+from readcraft.validation import ReadmeValidator
+
+STAND_IN_README = (
+    "# Synthetic Module\n\n"
+    "## Usage\n\n"
+    "```bash\npython module.py\n```\n\n"
+    "## Examples\n\n"
+    "Call `main()` to run the synthetic workload end to end."
+)
+
+
+class LatencyHistogram:
+    """HDR-style histogram: log-scaled buckets with fixed relative precision.
+
+    Values are stored in microseconds. Each power-of-two range is split into
+    ``2 ** precision_bits`` sub-buckets, so every recorded value is kept to
+    within ``1 / 2 ** precision_bits`` of its true value (under 1% by default)
+    while memory stays bounded no matter how long the run lasts.
+    """
+
+    def __init__(self, precision_bits=7):
+        self.precision_bits = precision_bits
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def _bucket(self, micros):
+        shift = max(0, micros.bit_length() - self.precision_bits)
+        return (micros >> shift) << shift
+
+    def record(self, seconds):
+        micros = max(1, int(seconds * 1_000_000))
+        bucket = self._bucket(micros)
+        with self._lock:
+            self.counts[bucket] = self.counts.get(bucket, 0) + 1
+            self.count += 1
+            self.total += micros
+            self.min = micros if self.min is None else min(self.min, micros)
+            self.max = micros if self.max is None else max(self.max, micros)
+
+    def percentile(self, percent):
+        """Return the value in milliseconds at ``percent`` (0-100)."""
+        with self._lock:
+            if not self.count:
+                return None
+            target = max(1, round(self.count * percent / 100))
+            seen = 0
+            for bucket in sorted(self.counts):
+                seen += self.counts[bucket]
+                if seen >= target:
+                    return min(bucket, self.max) / 1000
+            return self.max / 1000
+
+    def to_dict(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "min_ms": self.min / 1000,
+            "mean_ms": round(self.total / self.count / 1000, 3),
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "p99_9_ms": self.percentile(99.9),
+            "max_ms": self.max / 1000,
+            "buckets_us": {str(k): v for k, v in sorted(self.counts.items())},
+        }
+
+
+class StandInServer:
+    """Local chat-completions endpoint with configurable fault injection.
+
+    Each request is answered after ``latency_ms``; a seeded RNG then decides
+    whether to inject a fault: ``error_rate`` returns HTTP 500,
+    ``drop_rate`` closes the connection without replying, ``slow_rate`` adds
+    ``slow_ms`` of extra latency and ``truncate_rate`` returns a cut-off
+    README with ``finish_reason=length``.
+    """
+
+    def __init__(
+        self,
+        latency_ms=20,
+        error_rate=0.0,
+        drop_rate=0.0,
+        slow_rate=0.0,
+        slow_ms=500,
+        truncate_rate=0.0,
+        seed=0,
+    ):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.truncate_rate = truncate_rate
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/openai/v1/chat/completions"
+
+    def _pick_fault(self):
+        with self._lock:
+            self.requests += 1
+            roll = self._random.random()
+        for fault, rate in (
+            ("error", self.error_rate),
+            ("drop", self.drop_rate),
+            ("slow", self.slow_rate),
+            ("truncate", self.truncate_rate),
+        ):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+                fault = stand_in._pick_fault()
+
+                delay = stand_in.latency_ms
+                if fault == "slow":
+                    delay += stand_in.slow_ms
+                time.sleep(delay / 1000)
+
+                if fault == "drop":
+                    self.close_connection = True
+                    return
+                if fault == "error":
+                    self._reply(500, {"error": {"message": "injected fault"}})
+                    return
+
+                content, finish_reason = STAND_IN_README, "stop"
+                if fault == "truncate":
+                    content, finish_reason = STAND_IN_README[:40], "length"
+                self._reply(
+                    200,
+                    {
+                        "choices": [
+                            {
+                                "message": {"content": content},
+                                "finish_reason": finish_reason,
+                            }
+                        ],
+                        "usage": {"total_tokens": len(content) // 4},
+                    },
+                )
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def sample_resources():
+    """Current RSS in bytes and open file-descriptor count (Linux /proc)."""
+    rss_bytes = None
+    try:
+        with open("/proc/self/statm") as statm:
+            rss_bytes = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    try:
+        fds = len(os.listdir("/proc/self/fd"))
+    except OSError:
+        fds = None
+    return {"rss_bytes": rss_bytes, "fds": fds}
+
+
+def write_sources(source_dir, count):
+    """Create ``count`` small synthetic Python files to feed the pipeline."""
+    source_dir.mkdir(parents=True, exist_ok=True)
+    files = []
+    for index in range(count):
+        file_path = source_dir / f"module_{index}.py"
+        file_path.write_text(
+            f"def handler_{index}(event):\n    return {{'id': {index}, 'event': event}}\n"
+        )
+        files.append(file_path)
+    return files
+
+
+def run_soak(options):
+    """Drive the real per-file pipeline against a stand-in server.
+
+    Returns a report with the latency histogram, outcome counts and the
+    RSS / file-descriptor samples taken every ``sample_interval`` seconds.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir, StandInServer(
+        latency_ms=options.latency_ms,
+        error_rate=options.error_rate,
+        drop_rate=options.drop_rate,
+        slow_rate=options.slow_rate,
+        slow_ms=options.slow_ms,
+        truncate_rate=options.truncate_rate,
+        seed=options.seed,
+    ) as server:
+        files = write_sources(Path(temp_dir) / "src", options.files)
+        pipeline_args = argparse.Namespace(
+            api_key="soak-test",
+            model="soak-model",
+            output_dir=str(Path(temp_dir) / "out"),
+            stream=False,
+            json=False,
+            quality_retries=options.quality_retries,
+        )
+        config_manager = ConfigManager(pipeline_args, {})
+        output_manager = OutputManager(config_manager.output_dir, json_output=False)
+        validator = ReadmeValidator()
+        journal = None
+        if options.journal:
+            journal = RunJournal(Path(temp_dir) / "journal.jsonl", truncate=True)
+
+        session = requests.Session() if options.session else None
+        configure_http(session=session, api_url=server.url)
+
+        histogram = LatencyHistogram()
+        outcomes = {"success": 0, "failure": 0, "exceptions": 0, "regenerations": 0}
+        # First few distinct crash messages, kept for the report
+        exception_samples = []
+        outcome_lock = threading.Lock()
+        next_file = itertools.count()
+        samples = []
+        started = time.time()
+        deadline = started + options.duration
+        stop_sampling = threading.Event()
+
+        def sampler():
+            while True:
+                sample = sample_resources()
+                sample["elapsed_seconds"] = round(time.time() - started, 3)
+                with outcome_lock:
+                    sample["completed"] = outcomes["success"] + outcomes["failure"]
+                samples.append(sample)
+                if stop_sampling.wait(options.sample_interval):
+                    break
+
+        def worker():
+            while time.time() < deadline:
+                with outcome_lock:
+                    file_path = files[next(next_file) % len(files)]
+                request_started = time.perf_counter()
+                # A crash must not silently shrink the load; count it and go on
+                try:
+                    result = process_file(
+                        file_path,
+                        config_manager,
+                        output_manager,
+                        pipeline_args,
+                        journal,
+                        validator,
+                    )
+                    regenerations = result["quality"]["attempts"] - 1
+                    status = result["status"]
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    with outcome_lock:
+                        outcomes["exceptions"] += 1
+                        if (
+                            len(exception_samples) < 10
+                            and error not in exception_samples
+                        ):
+                            exception_samples.append(error)
+                    continue
+                histogram.record(time.perf_counter() - request_started)
+                with outcome_lock:
+                    outcomes[status] += 1
+                    outcomes["regenerations"] += regenerations
+
+        sampling_thread = threading.Thread(target=sampler, daemon=True)
+        sampling_thread.start()
+        workers = [threading.Thread(target=worker) for _ in range(options.concurrency)]
+        try:
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+        finally:
+            stop_sampling.set()
+            sampling_thread.join()
+            configure_http()
+            if session:
+                session.close()
+            if journal:
+                journal.close()
+
+        elapsed = time.time() - started
+        completed = outcomes["success"] + outcomes["failure"]
+        return {
+            "duration_seconds": round(elapsed, 3),
+            "concurrency": options.concurrency,
+            "completed": completed,
+            "throughput_per_second": round(completed / elapsed, 3) if elapsed else 0,
+            "outcomes": outcomes,
+            "exceptions": exception_samples,
+            "error_rate": round(outcomes["failure"] / completed, 4) if completed else 0,
+            "server_requests": server.requests,
+            "latency": histogram.to_dict(),
+            "resources": samples,
+        }
+
+
+def check_thresholds(report, options):
+    """Return a list of threshold violations; empty means the run passed."""
+    violations = []
+    crashes = report["outcomes"]["exceptions"]
+    if crashes:
+        violations.append(
+            f"{crashes} unhandled exception(s) in the pipeline: "
+            + "; ".join(report["exceptions"])
+        )
+    if report["completed"] == 0:
+        violations.append("no requests completed")
+    p99 = report["latency"].get("p99_ms")
+    if options.max_p99_ms is not None and p99 is not None and p99 > options.max_p99_ms:
+        violations.append(f"p99 latency {p99}ms exceeds {options.max_p99_ms}ms")
+    if (
+        options.max_error_rate is not None
+        and report["error_rate"] > options.max_error_rate
+    ):
+        violations.append(
+            f"error rate {report['error_rate']} exceeds {options.max_error_rate}"
+        )
+
+    # Growth is measured from the first sample after warm-up to the last one,
+    # so connections opened while ramping up are part of the baseline
+    samples = [
+        sample
+        for sample in report["resources"]
+        if sample["elapsed_seconds"] >= options.warmup
+    ] or report["resources"]
+    if len(samples) >= 2:
+        first, last = samples[0], samples[-1]
+        if options.max_rss_growth_mb is not None and first["rss_bytes"] is not None:
+            growth_mb = (last["rss_bytes"] - first["rss_bytes"]) / (1024 * 1024)
+            if growth_mb > options.max_rss_growth_mb:
+                violations.append(
+                    f"RSS grew {growth_mb:.1f}MB, limit {options.max_rss_growth_mb}MB"
+                )
+        if options.max_fd_growth is not None and first["fds"] is not None:
+            fd_growth = last["fds"] - first["fds"]
+            if fd_growth > options.max_fd_growth:
+                violations.append(
+                    f"open file descriptors grew by {fd_growth}, "
+                    f"limit {options.max_fd_growth}"
+                )
+    return violations
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Soak/load-test the ReadCraft pipeline against a local stand-in API."
+    )
+    parser.add_argument(
+        "--duration", type=float, default=60, help="Seconds to run (default: 60)"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Concurrent pipeline threads"
+    )
+    parser.add_argument(
+        "--files", type=int, default=20, help="Synthetic source files to cycle through"
+    )
+    parser.add_argument(
+        "--session",
+        action="store_true",
+        help="Use a pooled requests.Session, as worker processes do",
+    )
+    parser.add_argument(
+        "--journal", action="store_true", help="Record progress in a run journal"
+    )
+    parser.add_argument(
+        "--quality-retries",
+        type=int,
+        default=1,
+        help="Regenerations allowed per README that fails validation",
+    )
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between RSS / file-descriptor samples",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=float,
+        default=5.0,
+        help="Seconds before the RSS / file-descriptor baseline is taken",
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=20, help="Base stand-in server latency"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of HTTP 500 replies"
+    )
+    parser.add_argument(
+        "--drop-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of connections closed without a reply",
+    )
+    parser.add_argument(
+        "--slow-rate", type=float, default=0.0, help="Fraction of slow replies"
+    )
+    parser.add_argument(
+        "--slow-ms", type=float, default=500, help="Extra latency of slow replies"
+    )
+    parser.add_argument(
+        "--truncate-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of replies cut off with finish_reason=length",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Fault injection seed")
+    parser.add_argument(
+        "--max-p99-ms", type=float, help="Fail if p99 latency exceeds this"
+    )
+    parser.add_argument(
+        "--max-error-rate", type=float, help="Fail if the failure rate exceeds this"
+    )
+    parser.add_argument(
+        "--max-rss-growth-mb", type=float, help="Fail if RSS grows by more than this"
+    )
+    parser.add_argument(
+        "--max-fd-growth", type=int, help="Fail if open file descriptors grow by more"
+    )
+    parser.add_argument(
+        "--report", type=str, help="Write the JSON report here instead of stdout"
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Show the pipeline's own log output"
+    )
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.files < 1:
+        parser.error("--files must be at least 1")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    root_logger = logging.getLogger()
+    previous_level = root_logger.level
+    if not args.verbose:
+        root_logger.setLevel(logging.CRITICAL)
+    try:
+        report = run_soak(args)
+    finally:
+        root_logger.setLevel(previous_level)
+
+    violations = check_thresholds(report, args)
+    report["violations"] = violations
+    report["passed"] = not violations
+
+    if args.report:
+        with open(args.report, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    for violation in violations:
+        print(f"FAIL: {violation}", file=sys.stderr)
+    sys.exit(0 if not violations else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import re
+
+HEADING_PATTERN = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$")
+FENCE_PATTERN = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+
+
+def scan_markdown(content):
+    """Return the ATX headings outside code blocks and whether a fence is left open."""
+    headings = []
+    fence = None
+    for line in content.splitlines():
+        match = FENCE_PATTERN.match(line)
+        if match:
+            marker = match.group(1)
+            if fence is None:
+                fence = marker[0] * len(marker)
+            elif marker.startswith(fence):
+                fence = None
+            continue
+        if fence is None:
+            heading = HEADING_PATTERN.match(line)
+            if heading:
+                headings.append(heading.group(1))
+    return headings, fence is not None
+
+
+class ReadmeValidator:
+    """Cheap local checks on a generated README.
+
+    ``validate`` returns a list of human-readable issues; an empty list
+    means the README passed and does not need to be regenerated.
+
+    ``min_headings`` defaults to 0 because the default "fun" prompt asks for
+    **bold** section titles rather than ``#`` headings.
+    """
+
+    def __init__(
+        self, required_headings=(), min_length=50, max_length=20000, min_headings=0
+    ):
+        self.required_headings = [heading.lower() for heading in required_headings]
+        self.min_length = min_length
+        self.max_length = max_length
+        self.min_headings = min_headings
+
+    @classmethod
+    def from_config(cls, config):
+        """Build from the ``[validation]`` table of the TOML config."""
+        validation_config = config.get("validation", {})
+        return cls(
+            required_headings=validation_config.get("required_headings", ()),
+            min_length=validation_config.get("min_length", 50),
+            max_length=validation_config.get("max_length", 20000),
+            min_headings=validation_config.get("min_headings", 0),
+        )
+
+    def validate(self, content, finish_reason=None):
+        if not content or not content.strip():
+            return ["empty response"]
+
+        issues = []
+        if finish_reason == "length":
+            issues.append("truncated response (finish_reason=length)")
+
+        length = len(content.strip())
+        if length < self.min_length:
+            issues.append(f"too short ({length} < {self.min_length} characters)")
+        if self.max_length and length > self.max_length:
+            issues.append(f"too long ({length} > {self.max_length} characters)")
+
+        headings, unclosed_fence = scan_markdown(content)
+        if unclosed_fence:
+            issues.append("unbalanced code fence")
+
+        if len(headings) < self.min_headings:
+            issues.append(
+                f"expected at least {self.min_headings} heading(s), found {len(headings)}"
+            )
+        heading_text = [heading.lower() for heading in headings]
+        for required in self.required_headings:
+            if not any(required in heading for heading in heading_text):
+                issues.append(f"missing required heading '{required}'")
+
+        return issues
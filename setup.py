@@ -20,6 +20,7 @@ setup(
     entry_points={
         'console_scripts': [
             'readcraft=readcraft.readme_generator:main',
+            'readcraft-soak=readcraft.soak:main',
         ],
     },
     classifiers=[
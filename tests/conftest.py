@@ -0,0 +1,49 @@
+from pathlib import Path
+from unittest.mock import patch
+from readcraft.readme_generator import main
+import pytest
+import sys
+import tempfile
+
+GOOD_README = (
+    "# Sample Script\n\n"
+    "## Usage\n\n"
+    "```bash\npython sample.py\n```\n\n"
+    "## Examples\n\nPrints a friendly greeting."
+)
+
+
+@pytest.fixture
+def good_readme():
+    """A README that passes the default validator."""
+    return GOOD_README
+
+
+@pytest.fixture
+def mock_make_api_request():
+    """Patch the API call to answer every file with ``good_readme``."""
+    with patch("readcraft.readme_generator.make_api_request") as mock_request:
+        mock_request.return_value = (GOOD_README, {}, "stop")
+        yield mock_request
+
+
+@pytest.fixture
+def project():
+    """Yield ``(source_dir, output_dir)``; only the source directory exists."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_dir = Path(temp_dir) / "src"
+        source_dir.mkdir()
+        yield source_dir, Path(temp_dir) / "out"
+
+
+@pytest.fixture
+def run_main():
+    """Run the CLI with the given arguments and check its exit code."""
+
+    def run(*args, expected_code=0):
+        with patch.object(sys, "argv", ["readcraft", *map(str, args)]):
+            with pytest.raises(SystemExit) as exit_info:
+                main()
+        assert exit_info.value.code == expected_code
+
+    return run
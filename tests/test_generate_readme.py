@@ -64,7 +64,7 @@ def test_generate_readme_with_valid_api_key():
 
     # Mock the response from make_api_request to avoid real API calls
     with patch("readcraft.readme_generator.make_api_request") as mock_request:
-        mock_request.return_value = ("Mocked README content", {})
+        mock_request.return_value = ("Mocked README content", {}, "stop")
 
         # Call the function
         result = generate_readme(file_contents, api_key, model, file_extension, stream)
@@ -327,7 +327,7 @@ def test_generate_readme_with_output_manager(mock_post):
 # Test for basic functionality with mocked successful response
 @patch("readcraft.readme_generator.make_api_request")
 def test_generate_readme_success(mock_make_api_request):
-    mock_make_api_request.return_value = ("Mocked README content", {})
+    mock_make_api_request.return_value = ("Mocked README content", {}, "stop")
 
     api_key = "mock_api_key"
     model = "mock_model"
@@ -354,7 +354,7 @@ def test_generate_readme_empty_content():
 # Test for error handling when make_api_request returns None
 @patch("readcraft.readme_generator.make_api_request")
 def test_generate_readme_error_handling(mock_make_api_request):
-    mock_make_api_request.return_value = (None, None)
+    mock_make_api_request.return_value = (None, None, None)
 
     api_key = "mock_api_key"
     model = "mock_model"
@@ -0,0 +1,138 @@
+from pathlib import Path
+from readcraft.journal import (
+    RunJournal,
+    load_journal,
+    select_pending,
+    DONE,
+    FAILED,
+    IN_FLIGHT,
+    journal_key,
+)
+import tempfile
+import threading
+
+
+def test_journal_replay_keeps_latest_state():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        journal_path = Path(temp_dir) / "journal.jsonl"
+        with RunJournal(journal_path) as journal:
+            journal.queued("a.py")
+            journal.queued("b.py")
+            journal.in_flight("a.py")
+            journal.done("a.py", output="out/a_README.md", usage={"total_tokens": 5})
+            journal.in_flight("b.py")
+            journal.failed("b.py", error="empty response")
+
+        states = load_journal(journal_path)
+        assert states[journal_key("a.py")]["state"] == DONE
+        assert states[journal_key("a.py")]["output"] == "out/a_README.md"
+        assert states[journal_key("a.py")]["usage"] == {"total_tokens": 5}
+        assert states[journal_key("b.py")]["state"] == FAILED
+
+
+def test_journal_ignores_torn_last_line():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        journal_path = Path(temp_dir) / "journal.jsonl"
+        with RunJournal(journal_path) as journal:
+            journal.in_flight("a.py")
+        with open(journal_path, "a") as f:
+            f.write('{"file": "%s", "sta' % journal_key("a.py"))
+
+        states = load_journal(journal_path)
+        assert states[journal_key("a.py")]["state"] == IN_FLIGHT
+
+
+def test_journal_concurrent_writers():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        journal_path = Path(temp_dir) / "journal.jsonl"
+        journal = RunJournal(journal_path, sync_every=7)
+
+        def worker(index):
+            for n in range(50):
+                journal.done(f"file_{index}_{n}.py")
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        journal.close()
+
+        states = load_journal(journal_path)
+        assert len(states) == 400
+        assert all(record["state"] == DONE for record in states.values())
+
+
+def test_select_pending_resume_and_retry_failed():
+    files = [Path("done.py"), Path("failed.py"), Path("inflight.py"), Path("new.py")]
+    states = {
+        journal_key("done.py"): {"state": DONE},
+        journal_key("failed.py"): {"state": FAILED},
+        journal_key("inflight.py"): {"state": IN_FLIGHT},
+    }
+
+    assert select_pending(files, states, resume=True) == [
+        Path("inflight.py"),
+        Path("new.py"),
+    ]
+    assert select_pending(files, states, retry_failed=True) == [Path("failed.py")]
+    assert select_pending(files, states) == files
+
+
+def test_main_resume_skips_finished_files(mock_make_api_request, project, run_main):
+    source_dir, output_dir = project
+    for name in ("a.py", "b.py", "c.py"):
+        (source_dir / name).write_text("print('hi')")
+
+    journal_path = output_dir / ".readcraft-journal.jsonl"
+    output_dir.mkdir()
+    with RunJournal(journal_path) as journal:
+        journal.done(source_dir / "a.py")
+        journal.in_flight(source_dir / "b.py")
+
+    run_main(source_dir, "-o", output_dir, "-a", "key", "--resume")
+
+    assert mock_make_api_request.call_count == 2
+    assert not (output_dir / "a_README.md").exists()
+    assert (output_dir / "b_README.md").exists()
+    assert (output_dir / "c_README.md").exists()
+    states = load_journal(journal_path)
+    assert all(record["state"] == DONE for record in states.values())
+    assert len(states) == 3
+
+
+def test_undecodable_file_is_journaled_as_failed(
+    mock_make_api_request, project, run_main
+):
+    source_dir, output_dir = project
+    (source_dir / "a.py").write_text("print('hi')")
+    (source_dir / "b.png").write_bytes(b"\x89PNG\r\n\x1a\n\xff\xfe\x00\x80")
+
+    # The first run fails on b.png; --resume then has nothing left to do
+    run_main(source_dir, "-o", output_dir, "-a", "key", expected_code=1)
+    run_main(source_dir, "-o", output_dir, "-a", "key", "--resume")
+
+    states = load_journal(output_dir / ".readcraft-journal.jsonl")
+    assert states[journal_key(source_dir / "a.py")]["state"] == DONE
+    assert states[journal_key(source_dir / "b.png")]["state"] == FAILED
+    assert "UnicodeDecodeError" in states[journal_key(source_dir / "b.png")]["error"]
+    assert (output_dir / "a_README.md").exists()
+    assert mock_make_api_request.call_count == 1
+
+
+def test_resume_matches_a_different_spelling_of_the_same_path(
+    mock_make_api_request, project, run_main, monkeypatch
+):
+    source_dir, output_dir = project
+    for name in ("a.py", "b.py"):
+        (source_dir / name).write_text("print('hi')")
+
+    monkeypatch.chdir(source_dir.parent)
+    run_main("src", "-o", "out", "-a", "key")
+    assert mock_make_api_request.call_count == 2
+
+    monkeypatch.chdir(source_dir)
+    run_main("../src/", "-o", output_dir, "-a", "key", "--resume")
+
+    assert mock_make_api_request.call_count == 2
+    assert len(load_journal(output_dir / ".readcraft-journal.jsonl")) == 2
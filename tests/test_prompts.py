@@ -0,0 +1,93 @@
+from unittest.mock import patch
+from readcraft.prompts import PromptBuilder, file_type_for
+from readcraft.readme_generator import configure_prompts, generate_readme
+
+
+def test_file_type_covers_many_languages():
+    assert file_type_for(".py") == "Python script"
+    assert file_type_for(".js") == "JavaScript script"
+    assert file_type_for(".RS") == "Rust script"
+    assert file_type_for(".go") == "Go script"
+    assert file_type_for(".txt") == "script"
+
+
+def test_prefix_is_shared_across_files():
+    builder = PromptBuilder()
+    first = builder.build_messages("print('a')", ".py")
+    second = builder.build_messages("fn main() {}", ".rs")
+
+    assert first[0] == second[0], "Expected an identical system prefix"
+    assert first[1]["content"].startswith("Generate a README for this Python script")
+    assert "fn main() {}" in second[1]["content"]
+
+
+def test_config_templates_and_languages():
+    config = {
+        "prompt": {
+            "style": "concise",
+            "languages": {".ex": "Elixir Script"},
+            "templates": {
+                "concise": {"python": {"instructions": "Document the Python API."}}
+            },
+        }
+    }
+    builder = PromptBuilder.from_config(config)
+
+    python_messages = builder.build_messages("x = 1", ".py")
+    assert "Document the Python API." in python_messages[0]["content"]
+    js_messages = builder.build_messages("let x = 1", ".js")
+    assert "Overview" in js_messages[0]["content"]
+    assert (
+        "Elixir Script script"
+        in builder.build_messages("IO.puts 1", ".ex")[1]["content"]
+    )
+
+
+def test_template_version_feeds_cache_key():
+    fun = PromptBuilder().template_for(".py")
+    concise = PromptBuilder(style="concise").template_for(".py")
+
+    assert fun.version != concise.version
+    assert fun.cache_key("model", "x = 1", ".py") == fun.cache_key(
+        "model", "x = 1", ".py"
+    )
+    assert fun.cache_key("model", "x = 1", ".py") != concise.cache_key(
+        "model", "x = 1", ".py"
+    )
+    assert fun.cache_key("model", "x = 1", ".py") != fun.cache_key(
+        "model", "x = 1", ".rs"
+    )
+
+
+def test_language_overrides_change_the_version():
+    default = PromptBuilder().template_for(".py")
+    cython = PromptBuilder(languages={".py": "Cython"}).template_for(".py")
+
+    assert default.version != cython.version
+    assert default.cache_key("model", "x = 1", ".py") != cython.cache_key(
+        "model", "x = 1", ".py"
+    )
+
+
+def test_unknown_style_falls_back_to_default():
+    builder = PromptBuilder(style="does-not-exist")
+    assert builder.style == "fun"
+
+
+@patch("requests.post")
+def test_generate_readme_sends_configured_template(mock_post):
+    mock_post.return_value.json = lambda: {
+        "choices": [{"message": {"content": "Mocked README content"}}],
+        "usage": {},
+    }
+
+    configure_prompts(PromptBuilder(style="concise"))
+    try:
+        generate_readme("x = 1", "mock_api_key", "mock_model", ".py")
+    finally:
+        configure_prompts(PromptBuilder())
+
+    messages = mock_post.call_args.kwargs["json"]["messages"]
+    assert messages[0]["role"] == "system"
+    assert "technical writer" in messages[0]["content"]
+    assert "Python script" in messages[1]["content"]
@@ -0,0 +1,171 @@
+from pathlib import Path
+from unittest.mock import patch
+from readcraft.sharding import (
+    RateBudget,
+    filter_shard,
+    relative_key,
+    run_workers,
+    shard_of,
+)
+from readcraft.journal import DONE, load_journal
+from readcraft.readme_generator import collect_files
+import json
+import multiprocessing
+import os
+import pytest
+import tempfile
+import time
+
+files = [Path(f"src/module_{n}.py") for n in range(200)]
+
+
+# Module-level workers so they can be pickled under any start method
+def healthy_worker(args, worker_index):
+    return [{"file": f"w{worker_index}.py", "status": "success"}], {
+        "worker_index": worker_index
+    }
+
+
+def dying_worker(args, worker_index):
+    if worker_index == 1:
+        os._exit(137)
+    return healthy_worker(args, worker_index)
+
+
+def raising_worker(args, worker_index):
+    if worker_index == 0:
+        raise RuntimeError("boom")
+    return healthy_worker(args, worker_index)
+
+
+def test_shard_of_is_deterministic():
+    assert shard_of("src/a.py", 4) == shard_of(Path("src/a.py"), 4)
+    assert all(0 <= shard_of(file_path, 7) < 7 for file_path in files)
+
+
+def test_filter_shard_partitions_every_file_once():
+    shards = [filter_shard(files, 3, index) for index in range(3)]
+    assert sorted(sum(shards, []), key=str) == sorted(files, key=str)
+    assert all(shard for shard in shards), "Expected every shard to get files"
+
+
+def test_workers_split_their_runner_shard():
+    runner_shard = set(filter_shard(files, 2, 1))
+    worker_slices = [
+        set(filter_shard(files, 2, 1, workers=3, worker_index=w)) for w in range(3)
+    ]
+    assert set().union(*worker_slices) == runner_shard
+    assert sum(len(worker_slice) for worker_slice in worker_slices) == len(runner_shard)
+
+
+def test_partition_ignores_the_absolute_checkout_prefix():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        roots = [
+            Path(temp_dir) / "home/runner/work/repo/src",
+            Path(temp_dir) / "builds/repo/src",
+        ]
+        for root in roots:
+            root.mkdir(parents=True)
+            for n in range(12):
+                (root / f"module_{n}.py").write_text("print('hi')")
+
+        partitions = []
+        for root in roots:
+            entries = collect_files([str(root)])
+            partitions.append(
+                [
+                    sorted(
+                        relative_key(entry)
+                        for entry in filter_shard(entries, 3, index, key=relative_key)
+                    )
+                    for index in range(3)
+                ]
+            )
+
+    assert partitions[0] == partitions[1]
+    assert sorted(sum(partitions[0], [])) == sorted(f"module_{n}.py" for n in range(12))
+
+
+def test_rate_budget_spaces_requests():
+    budget = RateBudget(50)
+    started = time.time()
+    for _ in range(6):
+        budget.acquire()
+    # First slot is immediate, the remaining five are 20ms apart
+    assert time.time() - started >= 0.09
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="requires the fork start method",
+)
+def test_main_with_workers_merges_results(mock_make_api_request, project, run_main):
+    mock_make_api_request.return_value = (
+        mock_make_api_request.return_value[0],
+        {"total_tokens": 3},
+        "stop",
+    )
+    source_dir, output_dir = project
+    for n in range(6):
+        (source_dir / f"file_{n}.py").write_text("print('hi')")
+
+    # The mock only reaches the workers through fork inheritance, so pin it
+    # rather than risk real API calls under spawn or forkserver
+    fork = multiprocessing.get_context("fork")
+    with patch("readcraft.sharding.multiprocessing.get_context", return_value=fork):
+        run_main(source_dir, "-o", output_dir, "-a", "key", "--workers", "2")
+
+    with open(output_dir / "readcraft-results.json") as f:
+        merged = json.load(f)
+
+    assert merged["metrics"]["files"] == 6
+    assert merged["metrics"]["succeeded"] == 6
+    assert merged["metrics"]["total_tokens"] == 18
+    assert len(merged["metrics"]["workers"]) == 2
+    assert len(list(output_dir.glob("*_README.md"))) == 6
+
+
+def test_shards_keep_separate_journals(mock_make_api_request, project, run_main):
+    source_dir, output_dir = project
+    for n in range(8):
+        (source_dir / f"file_{n}.py").write_text("print('hi')")
+
+    for shard_index in (0, 1):
+        run_main(
+            source_dir,
+            "-o",
+            output_dir,
+            "-a",
+            "key",
+            "--shards",
+            2,
+            "--shard-index",
+            shard_index,
+        )
+
+    done = 0
+    for shard_index in (0, 1):
+        journal_path = output_dir / f".readcraft-journal-shard{shard_index}.jsonl"
+        states = load_journal(journal_path)
+        assert all(record["state"] == DONE for record in states.values())
+        done += len(states)
+    assert done == len(list(output_dir.glob("*_README.md"))) == 8
+
+
+def test_run_workers_survives_a_dead_worker():
+    results, metrics = run_workers(None, dying_worker, 3)
+
+    assert sorted(result["file"] for result in results) == ["w0.py", "w2.py"]
+    assert metrics["failed_workers"] == [1]
+    assert metrics["workers"][1] == {
+        "worker_index": 1,
+        "error": "worker process died unexpectedly",
+    }
+
+
+def test_run_workers_keeps_results_when_a_worker_raises():
+    results, metrics = run_workers(None, raising_worker, 2)
+
+    assert [result["file"] for result in results] == ["w1.py"]
+    assert metrics["failed_workers"] == [0]
+    assert metrics["workers"][0]["error"] == "RuntimeError: boom"
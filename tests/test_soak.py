@@ -0,0 +1,140 @@
+from unittest.mock import patch
+from readcraft.soak import (
+    LatencyHistogram,
+    StandInServer,
+    build_parser,
+    check_thresholds,
+    main,
+)
+import json
+import logging
+import pytest
+import requests
+import tempfile
+import os
+
+
+def test_histogram_percentiles_within_precision():
+    histogram = LatencyHistogram()
+    for millis in range(1, 1001):
+        histogram.record(millis / 1000)
+
+    summary = histogram.to_dict()
+    assert summary["count"] == 1000
+    assert summary["max_ms"] == 1000
+    assert summary["p50_ms"] == pytest.approx(500, rel=0.01)
+    assert summary["p99_ms"] == pytest.approx(990, rel=0.01)
+
+
+def test_stand_in_server_injects_faults():
+    with StandInServer(latency_ms=0, error_rate=1.0) as server:
+        response = requests.post(server.url, json={}, timeout=5)
+        assert response.status_code == 500
+
+    with StandInServer(latency_ms=0, truncate_rate=1.0) as server:
+        body = requests.post(server.url, json={}, timeout=5).json()
+        assert body["choices"][0]["finish_reason"] == "length"
+
+
+def test_thresholds_report_violations():
+    options = build_parser().parse_args(
+        ["--max-p99-ms", "10", "--max-fd-growth", "2", "--warmup", "1"]
+    )
+    report = {
+        "completed": 40,
+        "latency": {"p99_ms": 25.0},
+        "error_rate": 0.0,
+        "outcomes": {"exceptions": 0},
+        "exceptions": [],
+        "resources": [
+            {"elapsed_seconds": 0, "rss_bytes": 1, "fds": 3},
+            {"elapsed_seconds": 1, "rss_bytes": 1, "fds": 10},
+            {"elapsed_seconds": 2, "rss_bytes": 1, "fds": 15},
+        ],
+    }
+
+    violations = check_thresholds(report, options)
+    assert violations == [
+        "p99 latency 25.0ms exceeds 10.0ms",
+        "open file descriptors grew by 5, limit 2",
+    ]
+
+
+def test_short_soak_run_passes():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        report_path = os.path.join(temp_dir, "report.json")
+        argv = [
+            "--duration",
+            "1",
+            "--warmup",
+            "0",
+            "--concurrency",
+            "2",
+            "--latency-ms",
+            "5",
+            "--truncate-rate",
+            "0.2",
+            "--sample-interval",
+            "0.2",
+            "--max-error-rate",
+            "0.5",
+            "--report",
+            report_path,
+        ]
+        level_before = logging.getLogger().level
+        with pytest.raises(SystemExit) as exit_info:
+            main(argv)
+        assert exit_info.value.code == 0
+        assert logging.getLogger().level == level_before
+
+        with open(report_path) as f:
+            report = json.load(f)
+
+    assert report["passed"] is True
+    assert report["completed"] > 0
+    assert report["latency"]["count"] == report["completed"]
+    assert report["outcomes"]["regenerations"] > 0
+    assert report["resources"][0]["fds"] is not None
+
+
+@patch("readcraft.soak.process_file", side_effect=KeyError("choices"))
+def test_soak_fails_on_pipeline_exceptions(mock_process_file):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        report_path = os.path.join(temp_dir, "report.json")
+        argv = ["--duration", "0.3", "--concurrency", "2", "--report", report_path]
+        with pytest.raises(SystemExit) as exit_info:
+            main(argv)
+        assert exit_info.value.code == 1
+
+        with open(report_path) as f:
+            report = json.load(f)
+
+    crashes = report["outcomes"]["exceptions"]
+    assert report["passed"] is False
+    assert crashes > 0
+    assert report["completed"] == 0
+    assert report["exceptions"] == ["KeyError: 'choices'"]
+    assert report["violations"][0].startswith(f"{crashes} unhandled exception(s)")
+    assert "no requests completed" in report["violations"]
+
+
+@pytest.mark.parametrize("flag", ["--files", "--concurrency"])
+def test_soak_rejects_empty_workloads(flag, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--duration", "0.1", flag, "0"])
+    assert exit_info.value.code == 2
+    assert f"{flag} must be at least 1" in capsys.readouterr().err
+
+
+def test_thresholds_fail_a_run_with_no_traffic():
+    options = build_parser().parse_args([])
+    report = {
+        "completed": 0,
+        "latency": {},
+        "error_rate": 0.0,
+        "outcomes": {"exceptions": 0},
+        "exceptions": [],
+        "resources": [],
+    }
+
+    assert check_thresholds(report, options) == ["no requests completed"]
@@ -0,0 +1,111 @@
+from pathlib import Path
+from readcraft.readme_generator import MAX_TOKENS
+from readcraft.validation import ReadmeValidator
+import json
+
+
+def test_valid_readme_passes(good_readme):
+    assert ReadmeValidator(required_headings=["usage"]).validate(good_readme) == []
+
+
+def test_truncated_response_fails(good_readme):
+    issues = ReadmeValidator().validate(good_readme, finish_reason="length")
+    assert issues == ["truncated response (finish_reason=length)"]
+
+
+def test_unbalanced_code_fence_fails(good_readme):
+    content = good_readme + "\n\n```python\nprint('cut off"
+    assert "unbalanced code fence" in ReadmeValidator().validate(content)
+
+
+def test_headings_inside_code_blocks_do_not_count():
+    content = "Some intro text that is long enough to pass.\n\n```\n# comment\n```"
+    issues = ReadmeValidator(min_headings=1).validate(content)
+    assert "expected at least 1 heading(s), found 0" in issues
+
+
+def test_bold_titles_from_default_prompt_pass():
+    # The default "fun" prompt asks for **bold** section titles, not # headings
+    content = (
+        "🎉 **Greeter Script** 🎉\n\n"
+        "**Function** 🛠: prints a friendly greeting.\n\n"
+        "**Usage** 🚀\n\n```bash\npython sample.py\n```\n\n"
+        "**Examples** ✨: running it prints `Hello, World!`."
+    )
+    assert ReadmeValidator().validate(content) == []
+    assert ReadmeValidator.from_config({}).validate(content) == []
+
+
+def test_length_bounds_and_required_headings(good_readme):
+    validator = ReadmeValidator(
+        required_headings=["Installation"], min_length=10, max_length=40
+    )
+    issues = validator.validate(good_readme)
+    assert any(issue.startswith("too long") for issue in issues)
+    assert "missing required heading 'installation'" in issues
+    assert ReadmeValidator().validate("# Hi") == ["too short (4 < 50 characters)"]
+    assert ReadmeValidator().validate("   ") == ["empty response"]
+
+
+def test_from_config_reads_validation_table():
+    validator = ReadmeValidator.from_config(
+        {"validation": {"required_headings": ["Usage"], "min_length": 5}}
+    )
+    assert validator.required_headings == ["usage"]
+    assert validator.min_length == 5
+
+
+def test_main_regenerates_only_failing_files(
+    mock_make_api_request, good_readme, project, run_main
+):
+    def respond(api_key, model, file_contents, file_extension, stream, max_tokens=None):
+        if "bad" in file_contents and mock_make_api_request.bad_calls < 1:
+            mock_make_api_request.bad_calls += 1
+            return good_readme[:60], {"total_tokens": 10}, "length"
+        return good_readme, {"total_tokens": 10}, "stop"
+
+    mock_make_api_request.bad_calls = 0
+    mock_make_api_request.side_effect = respond
+
+    source_dir, output_dir = project
+    (source_dir / "good.py").write_text("print('good')")
+    (source_dir / "bad.py").write_text("print('bad')")
+
+    run_main(source_dir, "-o", output_dir, "-a", "key", "--json")
+
+    assert mock_make_api_request.call_count == 3
+    with open(output_dir / "readcraft-results.json") as f:
+        merged = json.load(f)
+
+    assert merged["metrics"]["quality_passed"] == 2
+    assert merged["metrics"]["regenerations"] == 1
+    attempts = {
+        Path(result["file"]).name: result["quality"]["attempts"]
+        for result in merged["results"]
+    }
+    assert attempts == {"good.py": 1, "bad.py": 2}
+
+    # Only the retry after the truncated response asks for a bigger budget
+    budgets = sorted(
+        (call.args[2], call.kwargs.get("max_tokens", MAX_TOKENS))
+        for call in mock_make_api_request.call_args_list
+    )
+    assert budgets == [
+        ("print('bad')", MAX_TOKENS),
+        ("print('bad')", 2 * MAX_TOKENS),
+        ("print('good')", MAX_TOKENS),
+    ]
+
+
+def test_main_gives_up_after_retry_budget(mock_make_api_request, project, run_main):
+    mock_make_api_request.return_value = ("too short", {}, "stop")
+    source_file = project[0] / "sample.py"
+    source_file.write_text("print('hi')")
+
+    run_main(source_file, "-a", "key", "--quality-retries", 2, expected_code=1)
+
+    assert mock_make_api_request.call_count == 3
+    # Too-short responses are not truncations, so the budget stays put
+    assert all(
+        "max_tokens" not in call.kwargs for call in mock_make_api_request.call_args_list
+    )